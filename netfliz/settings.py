@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -26,6 +27,8 @@ CSRF_TRUSTED_ORIGINS = ["https://netfliz.onrender.com"]
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+TESTING = sys.argv[1:2] == ["test"]
+
 ALLOWED_HOSTS = [
     "192.168.3.3", 
     "localhost", 
@@ -7,6 +7,7 @@ from .models import Tenant, Video
 class TenantAdmin(admin.ModelAdmin):
     list_display = ("user", "slug", "is_active", "access_end_date", "show_subscription_popup")
     list_filter = ("is_active",)
+    list_select_related = ("user",)
     search_fields = ("user__username", "user__email", "slug")
     readonly_fields = ("show_subscription_popup",)
 
@@ -15,4 +16,5 @@ class TenantAdmin(admin.ModelAdmin):
 class VideoAdmin(admin.ModelAdmin):
     list_display = ("title", "tenant", "video_type", "is_public", "created_at")
     list_filter = ("video_type", "is_public", "tenant__is_active")
+    list_select_related = ("tenant", "tenant__user")
     search_fields = ("title", "tenant__slug")
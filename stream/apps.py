@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class StreamConfig(AppConfig):
@@ -6,22 +7,29 @@ class StreamConfig(AppConfig):
     name = 'stream'
 
     def ready(self):
-        from django.test.client import ContextList, store_rendered_templates as original_store
-        import django.test.client as test_client
         from django.template.context import BaseContext
 
+        from . import signals  # noqa: F401
+
         if getattr(BaseContext, "_copy_patch_applied", False):
             return
 
         def _patched_copy(self):
             duplicate = object.__new__(type(self))
             duplicate.__dict__.update(getattr(self, "__dict__", {}))
-            duplicate.dicts = [d.copy() for d in self.dicts]
+            duplicate.dicts = self.dicts[:]
             return duplicate
 
         BaseContext.__copy__ = _patched_copy
         BaseContext._copy_patch_applied = True
 
+        if getattr(settings, "TESTING", False):
+            self._patch_test_client()
+
+    def _patch_test_client(self):
+        from django.test.client import ContextList, store_rendered_templates as original_store
+        import django.test.client as test_client
+
         def _safe_store_rendered_templates(store, signal, sender, template, context, **kwargs):
             try:
                 return original_store(store, signal, sender, template, context, **kwargs)
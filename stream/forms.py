@@ -7,11 +7,13 @@ from urllib.parse import urlsplit, urlunsplit, quote, urlencode
 
 from .models import Series, Tenant, Video
 
-IFRAME_SRC_PATTERN = re.compile(r'src\s*=\s*["\\\']([^"\\\']+)["\\\']', re.IGNORECASE)
+IFRAME_SRC_PATTERN = re.compile(r'[sS][rR][cC]\s*=\s*["\\\']([^"\\\']+)["\\\']', re.ASCII)
 
 
 def _extract_iframe_src(value):
-    match = IFRAME_SRC_PATTERN.search(value or "")
+    if not value or "src" not in value.lower():
+        return None
+    match = IFRAME_SRC_PATTERN.search(value)
     return match.group(1) if match else None
 
 
@@ -24,7 +26,7 @@ class VideoForm(forms.ModelForm):
         ),
     )
     blocked_tenants = forms.ModelMultipleChoiceField(
-        queryset=Tenant.objects.filter(is_active=True),
+        queryset=Tenant.objects.filter(is_active=True).select_related("user").order_by("slug"),
         required=False,
         label="Ocultar para",
         help_text="Escolha as contas que não devem ver este vídeo.",
@@ -148,10 +150,12 @@ class VideoForm(forms.ModelForm):
     def clean_slug(self):
         slug = self.cleaned_data.get("slug") or ""
         if self.owner and slug:
-            exists = Video.objects.filter(tenant=self.owner, slug=slug)
-            if self.instance.pk:
-                exists = exists.exclude(pk=self.instance.pk)
-            if exists.exists():
+            exists = (
+                Video.objects.filter(tenant=self.owner, slug=slug)
+                .exclude(pk=self.instance.pk)
+                .exists()
+            )
+            if exists:
                 raise ValidationError(
                     "Já existe um vídeo com esse identificador para o proprietário atual."
                 )
@@ -159,16 +163,18 @@ class VideoForm(forms.ModelForm):
 
     def clean_source_url(self):
         source_url = (self.cleaned_data.get("source_url") or "").strip()
-        iframe_src = _extract_iframe_src(source_url)
-        if iframe_src:
-            source_url = iframe_src.strip()
+        if "<" in source_url:
+            iframe_src = _extract_iframe_src(source_url)
+            if iframe_src:
+                source_url = iframe_src.strip()
         if "#" in source_url:
             parsed = urlsplit(source_url)
             fragment = parsed.fragment
             encoded_fragment = quote(fragment, safe="")
-            source_url = urlunsplit(
-                (parsed.scheme, parsed.netloc, parsed.path, parsed.query, encoded_fragment)
-            )
+            if encoded_fragment != fragment:
+                source_url = urlunsplit(
+                    (parsed.scheme, parsed.netloc, parsed.path, parsed.query, encoded_fragment)
+                )
         return source_url
 
 
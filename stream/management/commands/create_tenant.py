@@ -2,7 +2,10 @@ import json
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -13,9 +16,9 @@ class Command(BaseCommand):
     help = "Cria um novo tenant com usuário, assinatura e registros iniciais."
 
     def add_arguments(self, parser):
-        parser.add_argument("business", help="Nome do negócio / tenant.")
-        parser.add_argument("--email", required=True, help="E-mail do usuário do tenant.")
-        parser.add_argument("--password", required=True, help="Senha inicial do usuário.")
+        parser.add_argument("business", nargs="?", help="Nome do negócio / tenant.")
+        parser.add_argument("--email", help="E-mail do usuário do tenant.")
+        parser.add_argument("--password", help="Senha inicial do usuário.")
         parser.add_argument(
             "--duration",
             type=int,
@@ -45,11 +48,25 @@ class Command(BaseCommand):
             "--sample-video-cover",
             help="URL da imagem de capa do vídeo de exemplo.",
         )
+        parser.add_argument(
+            "--from-jsonl",
+            help=(
+                "Arquivo JSONL com um tenant por linha (business, email, password e "
+                "opcionalmente duration, metadata e sample_video_*)."
+            ),
+        )
 
     def handle(self, *args, **options):
+        if options.get("from_jsonl"):
+            self._handle_batch(options["from_jsonl"])
+            return
+
         business = options["business"]
         email = options["email"]
         password = options["password"]
+        if not (business and email and password):
+            self.stderr.write("Informe o nome do negócio, --email e --password (ou use --from-jsonl).")
+            return
         duration = options["duration"]
         metadata_raw = options["metadata"]
         metadata = {}
@@ -61,44 +78,198 @@ class Command(BaseCommand):
 
         username = slugify(business) or f"user-{timezone.now().strftime('%Y%m%d%H%M%S')}"
         User = get_user_model()
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={"username": username, "is_active": True},
-        )
+        with transaction.atomic():
+            user, created = User.objects.get_or_create(
+                email=email,
+                defaults={
+                    "username": username,
+                    "is_active": True,
+                    "password": make_password(password),
+                },
+            )
+            if not created:
+                user.username = username
+                user.set_password(password)
+                user.save(update_fields=["username", "password"])
+
+            tenant_slug = slugify(business)
+            if not tenant_slug:
+                tenant_slug = username
+
+            tenant = Tenant.objects.create(
+                user=user,
+                slug=tenant_slug,
+                access_end_date=timezone.now() + timedelta(days=duration),
+                metadata=metadata,
+            )
+
+            title = options.get("sample_video_title")
+            url = options.get("sample_video_url")
+            video = None
+            if title and url:
+                video = Video.objects.create(
+                    tenant=tenant,
+                    title=title,
+                    slug=slugify(title),
+                    source_url=url,
+                    video_type=options["sample_video_type"],
+                    cover_url=options.get("sample_video_cover") or "",
+                    is_public=True,
+                )
+
         if created:
-            user.set_password(password)
-            user.save()
             self.stdout.write(f"Usuário {user.email} criado.")
         else:
-            user.username = username
-            user.set_password(password)
-            user.save(update_fields=["username", "password"])
             self.stdout.write(f"Usuário {user.email} existente atualizado.")
+        self.stdout.write(f"Tenant {tenant.slug} criado para {user.email}.")
+        if video:
+            self.stdout.write(f"Vídeo exemplo '{video.title}' cadastrado.")
 
-        tenant_slug = slugify(business)
-        if not tenant_slug:
-            tenant_slug = username
+    def _read_jsonl(self, path):
+        rows = []
+        video_types = {choice[0] for choice in Video.VIDEO_TYPES}
+        seen_emails = {}
+        seen_slugs = {}
+        now = timezone.now()
+        with open(path, encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    self.stderr.write(f"Linha {line_number} inválida. Use um JSON válido.")
+                    return None
+                if not isinstance(row, dict) or not (
+                    row.get("business") and row.get("email") and row.get("password")
+                ):
+                    self.stderr.write(
+                        f"Linha {line_number} sem business, email ou password."
+                    )
+                    return None
+                try:
+                    row["duration"] = int(row.get("duration", 30))
+                except (TypeError, ValueError):
+                    self.stderr.write(
+                        f"Linha {line_number} com duration inválido. Use um número inteiro de dias."
+                    )
+                    return None
+                metadata = row.get("metadata") or {}
+                if not isinstance(metadata, dict):
+                    self.stderr.write(
+                        f"Linha {line_number} com metadata inválido. Use um objeto JSON."
+                    )
+                    return None
+                row["metadata"] = metadata
+                video_type = row.get("sample_video_type") or "mp4"
+                if video_type not in video_types:
+                    self.stderr.write(
+                        f"Linha {line_number} com sample_video_type inválido. "
+                        f"Use {', '.join(sorted(video_types))}."
+                    )
+                    return None
+                row["sample_video_type"] = video_type
+                row["slug"] = slugify(row["business"]) or f"user-{now.strftime('%Y%m%d%H%M%S')}"
+                if row["email"] in seen_emails:
+                    self.stderr.write(
+                        f"Linha {line_number} repete o email da linha {seen_emails[row['email']]}."
+                    )
+                    return None
+                if row["slug"] in seen_slugs:
+                    self.stderr.write(
+                        f"Linha {line_number} repete o tenant {row['slug']} da linha "
+                        f"{seen_slugs[row['slug']]}."
+                    )
+                    return None
+                seen_emails[row["email"]] = line_number
+                seen_slugs[row["slug"]] = line_number
+                rows.append(row)
 
-        tenant = Tenant(
-            user=user,
-            slug=tenant_slug,
-            access_end_date=timezone.now() + timedelta(days=duration),
-            metadata=metadata,
+        existing = Tenant.objects.filter(
+            Q(slug__in=seen_slugs) | Q(user__email__in=seen_emails)
+        ).values_list("slug", "user__email")
+        for slug, email in existing:
+            if slug in seen_slugs:
+                self.stderr.write(f"Linha {seen_slugs[slug]}: o tenant {slug} já existe.")
+                return None
+            if email in seen_emails:
+                self.stderr.write(
+                    f"Linha {seen_emails[email]}: o usuário {email} já possui um tenant."
+                )
+                return None
+        taken_usernames = get_user_model().objects.filter(username__in=seen_slugs).values_list(
+            "username", "email"
         )
-        tenant.save()
-        self.stdout.write(f"Tenant {tenant.slug} criado para {user.email}.")
+        for username, email in taken_usernames:
+            line_number = seen_slugs[username]
+            if seen_emails.get(email) != line_number:
+                self.stderr.write(f"Linha {line_number}: o usuário {username} já existe.")
+                return None
+        return rows
 
-        title = options.get("sample_video_title")
-        url = options.get("sample_video_url")
-        if title and url:
-            cover = options.get("sample_video_cover") or ""
-            video = Video.objects.create(
-                tenant=tenant,
-                title=title,
-                slug=slugify(title),
-                source_url=url,
-                video_type=options["sample_video_type"],
-                cover_url=cover,
-                is_public=True,
-            )
-            self.stdout.write(f"Vídeo exemplo '{video.title}' cadastrado.")
+    def _handle_batch(self, path):
+        rows = self._read_jsonl(path)
+        if rows is None:
+            return
+        User = get_user_model()
+        now = timezone.now()
+
+        with transaction.atomic():
+            users_by_email = {
+                user.email: user
+                for user in User.objects.filter(email__in=[row["email"] for row in rows])
+            }
+            new_users = []
+            updated_users = []
+            for row in rows:
+                username = row["slug"]
+                user = users_by_email.get(row["email"])
+                if user is None:
+                    user = User(
+                        username=username,
+                        email=row["email"],
+                        is_active=True,
+                        password=make_password(row["password"]),
+                    )
+                    users_by_email[row["email"]] = user
+                    new_users.append(user)
+                elif user.pk is not None:
+                    user.username = username
+                    user.set_password(row["password"])
+                    updated_users.append(user)
+            User.objects.bulk_create(new_users)
+            User.objects.bulk_update(updated_users, ["username", "password"])
+
+            tenants = [
+                Tenant(
+                    user=users_by_email[row["email"]],
+                    slug=row["slug"],
+                    access_end_date=now + timedelta(days=row["duration"]),
+                    metadata=row["metadata"],
+                    # bulk_create skips Tenant.save(), which flags new subscriptions.
+                    show_subscription_popup=True,
+                )
+                for row in rows
+            ]
+            Tenant.objects.bulk_create(tenants)
+
+            videos = [
+                Video(
+                    tenant=tenant,
+                    title=row["sample_video_title"],
+                    slug=slugify(row["sample_video_title"]),
+                    source_url=row["sample_video_url"],
+                    video_type=row["sample_video_type"],
+                    cover_url=row.get("sample_video_cover") or "",
+                    is_public=True,
+                )
+                for row, tenant in zip(rows, tenants)
+                if row.get("sample_video_title") and row.get("sample_video_url")
+            ]
+            Video.objects.bulk_create(videos)
+
+        self.stdout.write(
+            f"{len(tenants)} tenants criados ({len(new_users)} usuários novos, "
+            f"{len(updated_users)} atualizados, {len(videos)} vídeos exemplo)."
+        )
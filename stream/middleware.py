@@ -2,7 +2,8 @@ from django.shortcuts import redirect
 
 
 class SubscriptionCheckMiddleware:
-    allowed_paths = {"/login/", "/logout/", "/support/", "/subscription-expired/"}
+    allowed_paths = frozenset({"/login/", "/logout/", "/support/", "/subscription-expired/"})
+    skipped_prefixes = ("/static/", "/media/")
 
     def __init__(self, get_response):
         self.get_response = get_response
@@ -13,12 +14,13 @@ class SubscriptionCheckMiddleware:
         return self.get_response(request)
 
     def _should_block(self, request):
+        path = request.path_info
+        if path in self.allowed_paths or path.startswith(self.skipped_prefixes):
+            return False
         user = getattr(request, "user", None)
         if user is None or not user.is_authenticated:
             return False
         tenant = getattr(user, "tenant_profile", None)
         if tenant is None or tenant.is_subscription_active:
             return False
-        if request.path_info in self.allowed_paths:
-            return False
         return True
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('stream', '0012_series_display_category'),
+    ]
+
+    operations = [
+        # EmailBackend looks users up with email__iexact, which compiles to
+        # UPPER("email") = UPPER(%s) and cannot use a plain b-tree on email.
+        # Raw SQL because auth_user belongs to django.contrib.auth, so this app
+        # cannot declare an Index(Upper("email")) in that model's Meta.
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS stream_auth_user_email_upper_idx ON auth_user (UPPER(email));',
+            reverse_sql='DROP INDEX IF EXISTS stream_auth_user_email_upper_idx;',
+        ),
+    ]
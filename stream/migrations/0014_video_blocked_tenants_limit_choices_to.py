@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-15 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stream', '0013_auth_user_email_upper_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='video',
+            options={},
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='blocked_tenants',
+            field=models.ManyToManyField(blank=True, help_text='Marque os tenants que não devem ver este vídeo.', limit_choices_to={'is_active': True}, related_name='blocked_videos', to='stream.tenant'),
+        ),
+    ]
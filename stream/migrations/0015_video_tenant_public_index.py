@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stream', '0014_video_blocked_tenants_limit_choices_to'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['tenant', 'is_public'], name='stream_video_tenant_public_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-15 14:57
+
+from django.db import migrations, models
+
+
+def backfill_has_blocks(apps, schema_editor):
+    Video = apps.get_model("stream", "Video")
+    Video.objects.filter(blocked_tenants__isnull=False).update(has_blocks=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stream', '0015_video_tenant_public_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='has_blocks',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_has_blocks, migrations.RunPython.noop),
+    ]
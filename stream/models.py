@@ -1,16 +1,31 @@
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 
 
+def tenant_cache_key(slug):
+    return f"tenant:{slug}"
+
+
+def visible_to_tenant(tenant):
+    return models.Q(has_blocks=False) | ~models.Q(blocked_tenants=tenant)
+
+
 def _generate_unique_slug(model, base, instance=None):
     slug = slugify(base or "")
     if not slug:
         slug = "tenant"
     original = slug
+    taken = set(
+        model.objects.exclude(pk=getattr(instance, "pk", None))
+        .filter(slug__startswith=original)
+        .values_list("slug", flat=True)
+    )
     idx = 1
-    while model.objects.exclude(pk=getattr(instance, "pk", None)).filter(slug=slug).exists():
+    while slug in taken:
         slug = f"{original}-{idx}"
         idx += 1
     return slug
@@ -31,7 +46,7 @@ class Tenant(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} ({self.slug})"
 
-    @property
+    @cached_property
     def is_subscription_active(self):
         return not self.access_end_date or self.access_end_date >= timezone.now()
 
@@ -43,21 +58,55 @@ class Tenant(models.Model):
                 instance=self,
             )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "access_end_date" in field_names:
+            instance._loaded_access_end_date = instance.access_end_date
+        if "slug" in field_names:
+            instance._loaded_slug = instance.slug
+        return instance
+
+    def _previous_access_end_date(self):
+        if "_loaded_access_end_date" in self.__dict__:
+            return True, self._loaded_access_end_date
+        previous = Tenant.objects.filter(pk=self.pk).only("access_end_date").first()
+        if previous is None:
+            return False, None
+        return True, previous.access_end_date
+
     def save(self, *args, **kwargs):
-        previous = None
-        if self.pk:
-            previous = Tenant.objects.filter(pk=self.pk).only("access_end_date").first()
+        self.__dict__.pop("is_subscription_active", None)
+        exists, previous_end_date = False, None
+        if self.pk and not self._state.adding:
+            exists, previous_end_date = self._previous_access_end_date()
         self._prepare_slug()
         if (
-            previous
+            exists
             and self.access_end_date
-            and previous.access_end_date
-            and self.access_end_date > previous.access_end_date
+            and previous_end_date
+            and self.access_end_date > previous_end_date
         ):
             self.show_subscription_popup = True
-        elif not previous and self.access_end_date:
+        elif not exists and self.access_end_date:
             self.show_subscription_popup = True
         super().save(*args, **kwargs)
+        # Drop the previous slug too, or a renamed tenant keeps resolving
+        # under its old slug until the cached entry expires.
+        slugs = {self.slug, self.__dict__.get("_loaded_slug", self.slug)}
+        cache.delete_many([tenant_cache_key(slug) for slug in slugs])
+        self._snapshot_loaded_fields(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.__dict__.pop("is_subscription_active", None)
+        self._snapshot_loaded_fields(fields)
+
+    def _snapshot_loaded_fields(self, fields=None):
+        if fields is None or "access_end_date" in fields:
+            self._loaded_access_end_date = self.access_end_date
+        if fields is None or "slug" in fields:
+            self._loaded_slug = self.slug
 
 
 class Series(models.Model):
@@ -164,8 +213,12 @@ class Video(models.Model):
         Tenant,
         blank=True,
         related_name="blocked_videos",
+        limit_choices_to={"is_active": True},
         help_text="Marque os tenants que não devem ver este vídeo.",
     )
+    # Kept in sync by stream.signals; lets listings skip the blocked_tenants
+    # anti-join for the (common) videos nobody is blocked from.
+    has_blocks = models.BooleanField(default=False, editable=False, db_index=True)
     rotate_180 = models.BooleanField(
         default=False,
         help_text="Rotacione o vídeo em 180° durante a reprodução.",
@@ -173,6 +226,10 @@ class Video(models.Model):
 
     class Meta:
         unique_together = ("tenant", "slug")
+        indexes = [
+            models.Index(fields=["tenant", "is_public"], name="stream_video_tenant_public_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = _generate_unique_slug(Video, self.title, instance=self)
@@ -182,6 +239,14 @@ class Video(models.Model):
                 self.series.display_category = Series.DISPLAY_CATEGORY_MININOVELA
                 self.series.save()
 
+        # The in-memory flag may predate a blocked_tenants change (forms save
+        # the row before save_m2m()), so re-read it instead of writing it back.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "has_blocks" in update_fields:
+            self.has_blocks = (
+                not self._state.adding
+                and Video.blocked_tenants.through.objects.filter(video_id=self.pk).exists()
+            )
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -204,6 +269,8 @@ class Video(models.Model):
         return self.video_type == self.EMBED_TYPE
 
     def is_visible_to(self, tenant):
+        if not self.has_blocks:
+            return True
         return not self.blocked_tenants.filter(pk=tenant.pk).exists()
 
 
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import Tenant, Video, tenant_cache_key
+
+
+def _refresh_has_blocks(video_ids):
+    blocked_ids = set(
+        Video.blocked_tenants.through.objects.filter(video_id__in=video_ids)
+        .values_list("video_id", flat=True)
+    )
+    Video.objects.filter(pk__in=blocked_ids).update(has_blocks=True)
+    Video.objects.filter(pk__in=set(video_ids) - blocked_ids).update(has_blocks=False)
+
+
+@receiver(m2m_changed, sender=Video.blocked_tenants.through)
+def sync_video_has_blocks(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action == "post_add":
+            has_blocks = True
+        elif action == "post_remove":
+            has_blocks = instance.blocked_tenants.exists()
+        elif action == "post_clear":
+            has_blocks = False
+        else:
+            return
+        instance.has_blocks = has_blocks
+        Video.objects.filter(pk=instance.pk).update(has_blocks=has_blocks)
+        return
+    # Reverse side: ``instance`` is a Tenant and ``pk_set`` holds video ids.
+    if action == "pre_clear":
+        instance._cleared_video_ids = list(instance.blocked_videos.values_list("pk", flat=True))
+    elif action == "post_add":
+        Video.objects.filter(pk__in=pk_set).update(has_blocks=True)
+    elif action == "post_remove":
+        _refresh_has_blocks(pk_set)
+    elif action == "post_clear":
+        _refresh_has_blocks(instance.__dict__.pop("_cleared_video_ids", []))
+
+
+# Deleting a tenant cascades its rows in the through table without firing
+# m2m_changed, so refresh the videos it was blocked from afterwards.
+@receiver(pre_delete, sender=Tenant)
+def remember_blocked_videos(sender, instance, **kwargs):
+    instance._blocked_video_ids = list(instance.blocked_videos.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Tenant)
+def refresh_blocked_videos(sender, instance, **kwargs):
+    _refresh_has_blocks(instance.__dict__.pop("_blocked_video_ids", []))
+
+
+# Also runs for queryset deletes (admin bulk action) and User cascades,
+# which never call Tenant.delete().
+@receiver(post_delete, sender=Tenant)
+def clear_tenant_cache(sender, instance, **kwargs):
+    cache.delete(tenant_cache_key(instance.slug))
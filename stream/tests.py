@@ -1,17 +1,37 @@
+import email.message
+import io
+import json
+import os
+import tempfile
 from datetime import timedelta
+from unittest import mock
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
 from django.http import Http404
 from django.urls import reverse
 from django.utils import timezone
+import requests
+from requests.cookies import MockRequest, MockResponse
+import urllib3
 
-from .models import Tenant, Video
-from .views import get_tenant_from_slug
+from . import views
+from .forms import VideoForm
+from .models import Tenant, Video, VideoProgress, visible_to_tenant
+from .views import (
+    _extract_google_drive_id,
+    _extract_m3u8_url,
+    get_or_create_owner_tenant,
+    get_tenant_from_slug,
+)
 
 
 class TenantIsolationTests(TestCase):
     def setUp(self):
+        cache.clear()
         User = get_user_model()
         self.user_one = User.objects.create_user(
             username="tenant-alpha",
@@ -56,6 +76,30 @@ class TenantIsolationTests(TestCase):
         self.assertContains(response, self.video_one.title)
         self.assertNotContains(response, self.video_two.title)
 
+    def test_tv_stream_cache_follows_source_url(self):
+        channel = Video.objects.create(
+            tenant=self.tenant_one,
+            title="Canal Alpha",
+            slug="canal-alpha",
+            source_url="https://tv.example.com/alpha",
+            video_type="m3u8",
+            category=Video.CATEGORY_TV,
+            is_public=True,
+        )
+        self.client.login(username="tenant-alpha", password="password123")
+        url = reverse("stream:tv-channel-stream", args=[channel.pk])
+        with mock.patch.object(
+            views.TvChannelStreamView,
+            "_resolve_stream",
+            side_effect=lambda source_url: ({"url": f"{source_url}.m3u8"}, 200),
+        ) as resolve:
+            self.assertEqual(self.client.get(url).json()["url"], "https://tv.example.com/alpha.m3u8")
+            self.client.get(url)
+            channel.source_url = "https://tv.example.com/beta"
+            channel.save()
+            self.assertEqual(self.client.get(url).json()["url"], "https://tv.example.com/beta.m3u8")
+        self.assertEqual(resolve.call_count, 2)
+
     def test_expired_tenant_redirects_to_subscription_view(self):
         expired_user = get_user_model().objects.create_user(
             username="tenant-expired",
@@ -78,6 +122,63 @@ class TenantIsolationTests(TestCase):
         with self.assertRaises(Http404):
             get_tenant_from_slug(slug)
 
+    def test_expired_tenant_lookup_is_not_cached(self):
+        Tenant.objects.filter(pk=self.tenant_one.pk).update(
+            access_end_date=timezone.now() - timedelta(days=1)
+        )
+        with self.assertRaises(Http404):
+            get_tenant_from_slug("tenant-alpha")
+        Tenant.objects.filter(pk=self.tenant_one.pk).update(
+            access_end_date=timezone.now() + timedelta(days=30)
+        )
+        self.assertEqual(get_tenant_from_slug("tenant-alpha"), self.tenant_one)
+
+    def test_tenant_lookup_cache_is_cleared_on_rename_and_cascade_delete(self):
+        get_tenant_from_slug("tenant-alpha")
+        self.tenant_one.slug = "tenant-gama"
+        self.tenant_one.save()
+        with self.assertRaises(Http404):
+            get_tenant_from_slug("tenant-alpha")
+        self.assertEqual(get_tenant_from_slug("tenant-gama"), self.tenant_one)
+
+        get_tenant_from_slug("tenant-beta")
+        self.user_two.delete()
+        with self.assertRaises(Http404):
+            get_tenant_from_slug("tenant-beta")
+
+    def test_extending_access_flags_subscription_popup(self):
+        tenant = Tenant.objects.get(pk=self.tenant_one.pk)
+        tenant.show_subscription_popup = False
+        tenant.save()
+        tenant.refresh_from_db()
+        self.assertFalse(tenant.show_subscription_popup)
+        tenant.access_end_date += timedelta(days=30)
+        with self.assertNumQueries(1):
+            tenant.save()
+        tenant.refresh_from_db()
+        self.assertTrue(tenant.show_subscription_popup)
+
+    def test_refresh_from_db_updates_loaded_access_end_date(self):
+        Tenant.objects.filter(pk=self.tenant_one.pk).update(show_subscription_popup=False)
+        tenant = Tenant.objects.get(pk=self.tenant_one.pk)
+        Tenant.objects.filter(pk=tenant.pk).update(
+            access_end_date=tenant.access_end_date + timedelta(days=30)
+        )
+        tenant.refresh_from_db()
+        tenant.save()
+        tenant.refresh_from_db()
+        self.assertFalse(tenant.show_subscription_popup)
+
+    def test_partial_save_keeps_unwritten_access_end_date_pending(self):
+        Tenant.objects.filter(pk=self.tenant_one.pk).update(show_subscription_popup=False)
+        tenant = Tenant.objects.get(pk=self.tenant_one.pk)
+        tenant.access_end_date += timedelta(days=30)
+        tenant.save(update_fields=["is_active"])
+        tenant.show_subscription_popup = False
+        tenant.save()
+        tenant.refresh_from_db()
+        self.assertTrue(tenant.show_subscription_popup)
+
     def test_tenant_portal_exposes_mininovela_videos(self):
         self.client.login(username="tenant-alpha", password="password123")
         Video.objects.create(
@@ -91,3 +192,394 @@ class TenantIsolationTests(TestCase):
         )
         response = self.client.get(reverse("stream:tenant-portal"))
         self.assertEqual(len(response.context["mininovela_videos"]), 1)
+
+    def test_tenant_portal_hides_videos_blocked_for_tenant(self):
+        self.client.login(username="tenant-alpha", password="password123")
+        blocked = Video.objects.create(
+            tenant=self.tenant_two,
+            title="Filme Bloqueado",
+            slug="filme-bloqueado",
+            source_url="https://cdn.example.com/videos/bloqueado.mp4",
+            video_type="mp4",
+            is_public=True,
+        )
+        blocked.blocked_tenants.add(self.tenant_one, self.tenant_two)
+        Video.objects.create(
+            tenant=self.tenant_two,
+            title="Filme Liberado",
+            slug="filme-liberado",
+            source_url="https://cdn.example.com/videos/liberado.mp4",
+            video_type="mp4",
+            is_public=True,
+        )
+        response = self.client.get(reverse("stream:tenant-portal"))
+        self.assertEqual(
+            [video.slug for video in response.context["videos"]],
+            ["filme-liberado"],
+        )
+
+    def test_has_blocks_tracks_blocked_tenants(self):
+        self.video_one.blocked_tenants.add(self.tenant_two)
+        self.video_one.refresh_from_db()
+        self.assertTrue(self.video_one.has_blocks)
+        self.tenant_two.blocked_videos.remove(self.video_one)
+        self.video_one.refresh_from_db()
+        self.assertFalse(self.video_one.has_blocks)
+        self.video_two.blocked_tenants.add(self.tenant_one)
+        self.tenant_one.delete()
+        self.video_two.refresh_from_db()
+        self.assertFalse(self.video_two.has_blocks)
+
+    def test_saving_stale_video_keeps_it_hidden_from_blocked_tenant(self):
+        video = Video.objects.create(
+            tenant=self.tenant_two,
+            title="Filme Bloqueado",
+            slug="filme-bloqueado",
+            source_url="https://cdn.example.com/videos/bloqueado.mp4",
+            is_public=True,
+        )
+        stale = Video.objects.get(pk=video.pk)
+        video.blocked_tenants.add(self.tenant_one)
+        stale.title = "Filme Bloqueado (editado)"
+        stale.save()
+        self.assertFalse(
+            Video.objects.filter(pk=video.pk).filter(visible_to_tenant(self.tenant_one)).exists()
+        )
+        self.assertFalse(Video.objects.get(pk=video.pk).is_visible_to(self.tenant_one))
+
+    def test_tenant_portal_lists_videos_in_progress(self):
+        self.client.login(username="tenant-alpha", password="password123")
+        watched = Video.objects.create(
+            tenant=self.tenant_two,
+            title="Filme Iniciado",
+            slug="filme-iniciado",
+            source_url="https://cdn.example.com/videos/filme.mp4",
+            video_type="mp4",
+            is_public=True,
+        )
+        Video.objects.create(
+            tenant=self.tenant_two,
+            title="Filme Novo",
+            slug="filme-novo",
+            source_url="https://cdn.example.com/videos/novo.mp4",
+            video_type="mp4",
+            is_public=True,
+        )
+        VideoProgress.objects.create(tenant=self.tenant_one, video=watched, position=125)
+        response = self.client.get(reverse("stream:tenant-portal"))
+        continue_movies = response.context["continue_movies"]
+        self.assertEqual([video.slug for video in continue_movies], ["filme-iniciado"])
+        self.assertEqual(continue_movies[0].resume_label, "2:05")
+
+    def test_tenant_portal_serves_stale_payload_while_rebuild_is_locked(self):
+        self.client.login(username="tenant-alpha", password="password123")
+        self.client.get(reverse("stream:tenant-portal"))
+        Video.objects.create(
+            tenant=self.tenant_two,
+            title="Filme Novo",
+            slug="filme-novo",
+            source_url="https://cdn.example.com/videos/novo.mp4",
+            video_type="mp4",
+            is_public=True,
+        )
+        cache_key = "tenant_portal:tenant-alpha"
+        entry = cache.get(cache_key)
+        entry["expires_at"] = 0
+        cache.set(cache_key, entry)
+
+        cache.add(f"{cache_key}:lock", True)
+        response = self.client.get(reverse("stream:tenant-portal"))
+        self.assertEqual(list(response.context["videos"]), [])
+
+        cache.delete(f"{cache_key}:lock")
+        response = self.client.get(reverse("stream:tenant-portal"))
+        self.assertEqual([video.slug for video in response.context["videos"]], ["filme-novo"])
+
+    def test_video_progress_creates_then_updates_single_row(self):
+        self.client.login(username="tenant-alpha", password="password123")
+        url = reverse(
+            "stream:video-progress",
+            kwargs={"slug": self.tenant_one.slug, "video_slug": self.video_one.slug},
+        )
+        for position in (12.5, 40):
+            response = self.client.post(
+                url, data={"position": position}, content_type="application/json"
+            )
+            self.assertEqual(response.json(), {"position": float(position)})
+        progress = VideoProgress.objects.get(tenant=self.tenant_one, video=self.video_one)
+        self.assertEqual(progress.position, 40.0)
+
+    def test_video_progress_skips_repeated_position(self):
+        self.client.login(username="tenant-alpha", password="password123")
+        url = reverse(
+            "stream:video-progress",
+            kwargs={"slug": self.tenant_one.slug, "video_slug": self.video_one.slug},
+        )
+        self.client.post(url, data={"position": 30}, content_type="application/json")
+        VideoProgress.objects.update(position=0)
+        self.client.post(url, data={"position": 31}, content_type="application/json")
+        self.assertEqual(VideoProgress.objects.get().position, 0)
+        self.client.post(url, data={"position": 35}, content_type="application/json")
+        self.assertEqual(VideoProgress.objects.get().position, 35)
+
+
+class VideoFormSourceUrlTests(TestCase):
+    def _clean_source_url(self, value):
+        form = VideoForm()
+        form.cleaned_data = {"source_url": value}
+        return form.clean_source_url()
+
+    def test_extracts_src_from_iframe_snippet(self):
+        value = '<IFRAME SRC="https://player.example.com/embed/1" allowfullscreen></IFRAME>'
+        self.assertEqual(
+            self._clean_source_url(value),
+            "https://player.example.com/embed/1",
+        )
+
+    def test_encodes_fragment_only_when_needed(self):
+        self.assertEqual(
+            self._clean_source_url("https://cdn.example.com/v.mp4#t=10"),
+            "https://cdn.example.com/v.mp4#t%3D10",
+        )
+        self.assertEqual(
+            self._clean_source_url("https://cdn.example.com/v.mp4#intro"),
+            "https://cdn.example.com/v.mp4#intro",
+        )
+
+
+class SlugGenerationTests(TestCase):
+    def test_generated_slugs_skip_taken_suffixes(self):
+        user = get_user_model().objects.create_user(username="owner", password="password123")
+        tenant = Tenant.objects.create(user=user, slug="owner")
+        slugs = []
+        for _ in range(3):
+            video = Video.objects.create(
+                tenant=tenant,
+                title="Trailer",
+                source_url="https://cdn.example.com/videos/trailer.mp4",
+            )
+            slugs.append(video.slug)
+        self.assertEqual(slugs, ["trailer", "trailer-1", "trailer-2"])
+
+    def test_owner_tenant_falls_back_to_suffixed_slug(self):
+        User = get_user_model()
+        other = User.objects.create_user(username="other", password="password123")
+        Tenant.objects.create(user=other, slug="owner")
+        owner = User.objects.create_user(username="owner", password="password123")
+        self.assertEqual(get_or_create_owner_tenant(owner).slug, "owner-1")
+
+
+class GoogleDriveIdTests(SimpleTestCase):
+    def test_extracts_id_from_supported_url_shapes(self):
+        urls = {
+            "https://drive.google.com/file/d/1AbC_-x/view?usp=sharing": "1AbC_-x",
+            "https://drive.google.com/open?id=XYZ123": "XYZ123",
+            "https://docs.google.com/uc?export=download&id=QQ-1": "QQ-1",
+        }
+        for url, expected in urls.items():
+            self.assertEqual(_extract_google_drive_id(url), expected)
+
+    def test_ignores_non_drive_urls(self):
+        self.assertIsNone(_extract_google_drive_id("https://cdn.example.com/videos/alpha.mp4"))
+        self.assertIsNone(_extract_google_drive_id(""))
+
+
+class M3U8UrlTests(SimpleTestCase):
+    def test_extracts_first_playlist_url_from_page_bytes(self):
+        page = b'<video><source src="https://cdn.example.com/live/index.m3u8?token=1"></video>'
+        self.assertEqual(_extract_m3u8_url(page), "https://cdn.example.com/live/index.m3u8?token=1")
+
+    def test_returns_none_without_playlist(self):
+        self.assertIsNone(_extract_m3u8_url(b"<html>sem stream</html>"))
+        self.assertIsNone(_extract_m3u8_url(b""))
+
+
+class GoogleDriveStreamTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _drive_response(self, status=200, body=b"", headers=None, url="https://drive.example/file"):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {})
+        response.url = url
+        response.raw = urllib3.HTTPResponse(body=io.BytesIO(body), preload_content=False)
+        return response
+
+    def test_forwards_range_and_reuses_resolved_url(self):
+        final_url = "https://drive.example/final?id=abc"
+        calls = []
+
+        def fake_get(url, params=None, headers=None, cookies=None, stream=False):
+            calls.append((url, headers))
+            return self._drive_response(
+                status=206,
+                body=b"0123",
+                headers={"Content-Type": "video/mp4", "Content-Range": "bytes 0-3/10"},
+                url=final_url,
+            )
+
+        with mock.patch.object(views._HTTP_SESSION, "get", side_effect=fake_get):
+            for _ in range(2):
+                response = self.client.get(
+                    reverse("stream:google-drive-stream"),
+                    {"id": "abc", "proxy": "1"},
+                    HTTP_RANGE="bytes=0-3",
+                )
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(b"".join(response.streaming_content), b"0123")
+                self.assertEqual(response["Content-Range"], "bytes 0-3/10")
+        self.assertEqual(calls[0][0], views.GOOGLE_DRIVE_DOWNLOAD_URL)
+        self.assertEqual(calls[1], (final_url, {"Range": "bytes=0-3"}))
+
+    def test_confirm_request_reuses_warning_cookie_without_storing_it(self):
+        warning = self._drive_response(headers={"Content-Type": "text/html"})
+        warning.cookies.set("download_warning_abc", "tok")
+        video = self._drive_response(headers={"Content-Type": "video/mp4"})
+        with mock.patch.object(
+            views._HTTP_SESSION, "get", side_effect=[warning, video]
+        ) as get:
+            views._follow_drive_download("abc")
+        confirm_call = get.call_args_list[1]
+        self.assertEqual(confirm_call.kwargs["params"]["confirm"], "tok")
+        self.assertEqual(confirm_call.kwargs["cookies"].get("download_warning_abc"), "tok")
+
+        message = email.message.Message()
+        message["Set-Cookie"] = "download_warning_abc=tok; Path=/"
+        request = requests.Request("GET", views.GOOGLE_DRIVE_DOWNLOAD_URL).prepare()
+        views._HTTP_SESSION.cookies.extract_cookies(MockResponse(message), MockRequest(request))
+        self.assertEqual(len(views._HTTP_SESSION.cookies), 0)
+
+    def test_redirects_to_resolved_url_by_default(self):
+        final_url = "https://drive.example/final?id=abc"
+        drive_response = self._drive_response(headers={"Content-Type": "video/mp4"}, url=final_url)
+        with mock.patch.object(views._HTTP_SESSION, "get", return_value=drive_response) as get:
+            for _ in range(2):
+                response = self.client.get(reverse("stream:google-drive-stream"), {"id": "abc"})
+                self.assertRedirects(response, final_url, fetch_redirect_response=False)
+        self.assertEqual(get.call_count, 1)
+
+    def test_cached_url_returning_html_is_dropped_and_resolved_again(self):
+        cache.set(views._drive_url_cache_key("abc"), "https://drive.example/stale")
+        stale = self._drive_response(headers={"Content-Type": "text/html"})
+        fresh = self._drive_response(
+            headers={"Content-Type": "video/mp4"}, url="https://drive.example/fresh"
+        )
+        with mock.patch.object(views._HTTP_SESSION, "get", side_effect=[stale, fresh]):
+            response = views._follow_drive_download("abc")
+        self.assertIs(response, fresh)
+        self.assertEqual(
+            cache.get(views._drive_url_cache_key("abc")), "https://drive.example/fresh"
+        )
+
+    def test_redirect_fallback_proxies_without_resolving_twice(self):
+        warning = self._drive_response(headers={"Content-Type": "text/html"})
+        with mock.patch.object(views._HTTP_SESSION, "get", return_value=warning) as get:
+            response = self.client.get(reverse("stream:google-drive-stream"), {"id": "abc"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/html")
+        self.assertEqual(get.call_count, 1)
+
+
+class CreateTenantCommandTests(TestCase):
+    def _write_jsonl(self, rows):
+        handle = tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", encoding="utf-8", delete=False
+        )
+        with handle:
+            for row in rows:
+                handle.write(row if isinstance(row, str) else json.dumps(row))
+                handle.write("\n")
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def _run_batch(self, rows):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command(
+            "create_tenant", from_jsonl=self._write_jsonl(rows), stdout=stdout, stderr=stderr
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_batch_creates_users_tenants_and_sample_videos(self):
+        stdout, stderr = self._run_batch(
+            [
+                {
+                    "business": "Loja Alfa",
+                    "email": "alfa@example.com",
+                    "password": "senha123",
+                    "duration": 10,
+                    "metadata": {"plano": "basico"},
+                    "sample_video_title": "Boas Vindas",
+                    "sample_video_url": "https://cdn.example.com/videos/boas.m3u8",
+                    "sample_video_type": "m3u8",
+                },
+                {"business": "Loja Beta", "email": "beta@example.com", "password": "senha456"},
+            ]
+        )
+        self.assertEqual(stderr, "")
+        self.assertIn("2 tenants criados", stdout)
+        alfa = Tenant.objects.get(slug="loja-alfa")
+        self.assertEqual(alfa.user.email, "alfa@example.com")
+        self.assertTrue(alfa.user.check_password("senha123"))
+        self.assertEqual(alfa.metadata, {"plano": "basico"})
+        self.assertTrue(alfa.show_subscription_popup)
+        self.assertEqual(
+            list(alfa.videos.values_list("slug", "video_type")), [("boas-vindas", "m3u8")]
+        )
+        beta = Tenant.objects.get(slug="loja-beta")
+        self.assertEqual(beta.user.email, "beta@example.com")
+        self.assertFalse(beta.videos.exists())
+
+    def test_batch_rejects_invalid_lines_without_writing(self):
+        valid = {"business": "Loja Alfa", "email": "alfa@example.com", "password": "senha123"}
+        Tenant.objects.create(
+            user=get_user_model().objects.create_user(username="existente", password="x"),
+            slug="loja-existente",
+        )
+        cases = {
+            "repete o email": {**valid, "business": "Loja Gama"},
+            "repete o tenant": {**valid, "email": "gama@example.com"},
+            "duration inválido": {
+                **valid,
+                "email": "gama@example.com",
+                "business": "Gama",
+                "duration": "trinta",
+            },
+            "sample_video_type inválido": {
+                **valid,
+                "email": "gama@example.com",
+                "business": "Gama",
+                "sample_video_type": "bogus",
+            },
+            "metadata inválido": {
+                **valid,
+                "email": "gama@example.com",
+                "business": "Gama",
+                "metadata": ["plano"],
+            },
+            "já existe": {**valid, "email": "gama@example.com", "business": "Loja Existente"},
+        }
+        for message, bad_row in cases.items():
+            with self.subTest(message):
+                _, stderr = self._run_batch([valid, bad_row])
+                self.assertIn("Linha 2", stderr)
+                self.assertIn(message, stderr)
+                self.assertFalse(Tenant.objects.exclude(slug="loja-existente").exists())
+                self.assertFalse(
+                    get_user_model().objects.filter(email="alfa@example.com").exists()
+                )
+
+    def test_single_mode_rolls_back_user_when_tenant_creation_fails(self):
+        Tenant.objects.create(
+            user=get_user_model().objects.create_user(username="existente", password="x"),
+            slug="loja-alfa",
+        )
+        with self.assertRaises(IntegrityError):
+            call_command(
+                "create_tenant",
+                "Loja Alfa",
+                email="alfa@example.com",
+                password="senha123",
+                stdout=io.StringIO(),
+            )
+        self.assertFalse(get_user_model().objects.filter(email="alfa@example.com").exists())
@@ -1,15 +1,18 @@
-import json
+import hashlib
+import heapq
 import logging
+import time
+from http.cookiejar import DefaultCookiePolicy
 
 from django.contrib import messages
 from django.contrib.auth import logout as auth_logout, views as auth_views
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
-from django.db.models import Count
-from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.db import IntegrityError, models, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
@@ -17,48 +20,109 @@ from django.utils.text import slugify
 from django.views.generic import DeleteView, ListView, TemplateView, UpdateView
 from django.views.generic.base import View
 
+import orjson
 import requests
 import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 from .forms import PortalLoginForm, SeriesForm, VideoForm
-from .models import Series, Tenant, Video, VideoProgress
+from .models import (
+    Series,
+    Tenant,
+    Video,
+    VideoProgress,
+    _generate_unique_slug,
+    tenant_cache_key,
+    visible_to_tenant,
+)
+
+
+# Tenant.save() and deletes clear the cached entry, but only in the cache of
+# the process that made the change: with the default LocMemCache, other
+# workers keep the old tenant until this TTL expires, and queryset .update()
+# calls bypass invalidation entirely (clear tenant_cache_key() by hand).
+# The TTL is the only cross-process guarantee.
+TENANT_CACHE_TIMEOUT = 60
 
 
 def get_tenant_from_slug(slug):
-    tenant = Tenant.objects.filter(slug=slug, is_active=True).first()
-    if not tenant:
-        raise Http404("Tenant não encontrado ou inativo.")
-    if tenant.access_end_date and tenant.access_end_date < timezone.now():
+    cache_key = tenant_cache_key(slug)
+    tenant = cache.get(cache_key)
+    if tenant is None:
+        tenant = Tenant.objects.filter(slug=slug, is_active=True).first()
+        if not tenant:
+            raise Http404("Tenant não encontrado ou inativo.")
+        if not _is_expired(tenant):
+            # Expired tenants are never cached, so a renewal is visible to
+            # every worker on its next request.
+            cache.set(cache_key, tenant, timeout=TENANT_CACHE_TIMEOUT)
+    if _is_expired(tenant):
         raise Http404("Assinatura expirada.")
     return tenant
 
 
+def _is_expired(tenant):
+    return bool(tenant.access_end_date and tenant.access_end_date < timezone.now())
+
+
 
 GOOGLE_DRIVE_DOWNLOAD_URL = "https://docs.google.com/uc"
 GOOGLE_DRIVE_DOWNLOAD_PARAMS = {"export": "download"}
-
-DRIVE_ID_PATTERNS = [
-    r"/file/d/([0-9A-Za-z_-]+)",
-    r"id=([0-9A-Za-z_-]+)",
-    r"/open\\?id=([0-9A-Za-z_-]+)",
-]
-CONFIRM_TOKEN_PATTERN = re.compile(r"confirm=([0-9A-Za-z_-]+)")
+STREAM_CHUNK_SIZE = 256 * 1024
+DRIVE_URL_CACHE_TIMEOUT = 60 * 5
+DRIVE_FORWARDED_REQUEST_HEADERS = ("Range", "If-Range")
+DRIVE_FORWARDED_RESPONSE_HEADERS = (
+    "Content-Length",
+    "Content-Range",
+    "Accept-Ranges",
+    "ETag",
+    "Last-Modified",
+)
+
+# Shared by the Drive proxy and the TV channel lookup so upstream TLS
+# connections are kept alive and reused across requests.
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+# Never persist upstream cookies: the session outlives any one viewer, so a
+# stored Drive cookie would leak into every later request from this worker.
+_HTTP_SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+DRIVE_ID_PATTERN = re.compile(r"(?:/file/d/|[?&]id=)([0-9A-Za-z_-]+)", re.ASCII)
+CONFIRM_TOKEN_PATTERN = re.compile(r"confirm=([0-9A-Za-z_-]+)", re.ASCII)
 
 
 def _extract_confirm_token(body):
     match = CONFIRM_TOKEN_PATTERN.search(body)
     return match.group(1) if match else None
-CONFIRM_TOKEN_PATTERN = re.compile(r"confirm=([0-9A-Za-z_-]+)")
-CONFIRM_TOKEN_PATTERN = re.compile(r"confirm=([0-9A-Za-z_-]+)")
 
-M3U8_URL_PATTERN = re.compile(r"https?://[^\"'\\s<>]+\\.m3u8[^\"'\\s<>]*", re.IGNORECASE)
+
+# Matched against the raw response bytes so the page never has to be decoded.
+M3U8_URL_PATTERN = re.compile(rb"https?://[^\"'\s<>]+\.m3u8[^\"'\s<>]*", re.IGNORECASE)
+TV_STREAM_CACHE_TIMEOUT = 60
+TV_STREAM_FAILURE_CACHE_TIMEOUT = 10
+PROGRESS_DEBOUNCE_SECONDS = 5
+PROGRESS_DEBOUNCE_DELTA = 2.0
+OWNER_TENANT_CREATE_ATTEMPTS = 3
+CONTINUE_WATCHING_LIMIT = 20
 
 def get_or_create_owner_tenant(user):
-    tenant = getattr(user, "tenant_profile", None)
-    if tenant is not None:
-        return tenant
+    tenant = getattr(user, "_owner_tenant_cache", None)
+    if tenant is None:
+        tenant = getattr(user, "tenant_profile", None) or _create_owner_tenant(user)
+        user._owner_tenant_cache = tenant
+    return tenant
+
+
+def _create_owner_tenant(user):
     base = slugify(
         user.get_full_name()
         or user.username
@@ -67,57 +131,127 @@ def get_or_create_owner_tenant(user):
     )
     if not base:
         base = "proprietario"
+    # Try the plain slug first (one INSERT on the common path) and only look
+    # up taken suffixes when that collides, e.g. with a concurrent signup.
     slug = base
-    idx = 1
-    while Tenant.objects.filter(slug=slug).exists():
-        slug = f"{base}-{idx}"
-        idx += 1
+    for _ in range(OWNER_TENANT_CREATE_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return Tenant.objects.create(user=user, slug=slug)
+        except IntegrityError:
+            existing = Tenant.objects.filter(user=user).first()
+            if existing:
+                return existing
+            slug = _generate_unique_slug(Tenant, base)
     return Tenant.objects.create(user=user, slug=slug)
 
 
 def _extract_google_drive_id(url):
     if not url:
         return None
-    for pattern in DRIVE_ID_PATTERNS:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = DRIVE_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
 
+def _is_html_response(response):
+    return response.headers.get("Content-Type", "").startswith("text/html")
 
-def _follow_drive_download(file_id):
-    session = requests.Session()
+
+def _drive_url_cache_key(file_id):
+    return f"drive_url:{file_id}"
+
+
+def _follow_drive_download(file_id, headers=None):
+    session = _HTTP_SESSION
+    cache_key = _drive_url_cache_key(file_id)
+    final_url = cache.get(cache_key)
+    if final_url:
+        response = session.get(final_url, headers=headers, stream=True)
+        # An expired signed URL can come back 200 with Drive's HTML error or
+        # warning page; treat that as a miss and resolve from scratch.
+        if response.status_code in (200, 206) and not _is_html_response(response):
+            return response
+        response.close()
+        cache.delete(cache_key)
     params = {**GOOGLE_DRIVE_DOWNLOAD_PARAMS, "id": file_id}
-    response = session.get(GOOGLE_DRIVE_DOWNLOAD_URL, params=params, stream=True)
-    if response.status_code != 200:
+    response = session.get(GOOGLE_DRIVE_DOWNLOAD_URL, params=params, headers=headers, stream=True)
+    if response.status_code not in (200, 206):
         return response
     token = None
     for key, value in response.cookies.items():
         if key.startswith("download_warning"):
             token = value
             break
-    if not token:
+    # Only the "can't scan for viruses" warning page carries the token in its
+    # body; reading .text on the file itself would buffer the whole video.
+    if not token and _is_html_response(response):
         token = _extract_confirm_token(response.text)
     if token:
         params["confirm"] = token
-        response = session.get(GOOGLE_DRIVE_DOWNLOAD_URL, params=params, stream=True)
+        cookies = response.cookies
+        response.close()
+        response = session.get(
+            GOOGLE_DRIVE_DOWNLOAD_URL,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            stream=True,
+        )
+    if response.status_code in (200, 206) and not _is_html_response(response):
+        cache.set(cache_key, response.url, timeout=DRIVE_URL_CACHE_TIMEOUT)
     return response
 
 
+def _iter_drive_body(response):
+    # Read the urllib3 stream directly rather than through iter_content, and
+    # hand the connection back to the pool even if the client disconnects.
+    try:
+        yield from response.raw.stream(STREAM_CHUNK_SIZE, decode_content=True)
+    finally:
+        response.close()
+
+
 def google_drive_stream(request):
     file_id = request.GET.get("id")
     if not file_id:
         raise Http404("Arquivo do Google Drive não informado.")
-    response = _follow_drive_download(file_id)
-    if response.status_code != 200:
+    # Send the player straight to Drive so the bytes never pass through a
+    # worker; ?proxy=1 keeps the streaming path for clients that need it.
+    redirect_to_drive = not request.GET.get("proxy")
+    if redirect_to_drive:
+        final_url = cache.get(_drive_url_cache_key(file_id))
+        if final_url:
+            return redirect(final_url)
+    upstream_headers = {
+        header: request.headers[header]
+        for header in DRIVE_FORWARDED_REQUEST_HEADERS
+        if header in request.headers
+    }
+    response = _follow_drive_download(file_id, headers=upstream_headers)
+    if response.status_code not in (200, 206):
+        response.close()
         raise Http404("Não foi possível acessar o arquivo do Google Drive.")
+    # If Drive handed back the file itself, redirect to it; otherwise fall back
+    # to proxying this same response instead of resolving the file again.
+    if redirect_to_drive and not _is_html_response(response):
+        response.close()
+        return redirect(response.url)
     content_type = response.headers.get("Content-Type", "application/octet-stream")
-    content_length = response.headers.get("Content-Length")
-    stream = StreamingHttpResponse(response.iter_content(chunk_size=8192), content_type=content_type)
-    if content_length:
-        stream["Content-Length"] = content_length
+    if request.method == "HEAD":
+        response.close()
+        stream = HttpResponse(content_type=content_type, status=response.status_code)
+    else:
+        stream = StreamingHttpResponse(
+            _iter_drive_body(response),
+            content_type=content_type,
+            status=response.status_code,
+        )
+    for header in DRIVE_FORWARDED_RESPONSE_HEADERS:
+        value = response.headers.get(header)
+        if value:
+            stream[header] = value
     stream["Content-Disposition"] = f'inline; filename="{file_id}"'
-    stream["Cache-Control"] = "public, max-age=86400"
+    stream["Cache-Control"] = "private, max-age=600"
     return stream
 
 
@@ -128,6 +262,10 @@ def get_playback_source(source_url):
     return source_url
 
 
+def _progress_cache_key(tenant, video):
+    return f"progress:{tenant.pk}:{video.pk}"
+
+
 def format_duration_label(seconds):
     try:
         total_seconds = int(float(seconds))
@@ -164,9 +302,11 @@ class TenantPublicView(TemplateView):
         context = super().get_context_data(**kwargs)
         tenant = get_tenant_from_slug(kwargs["slug"])
         context["tenant"] = tenant
-        context["videos"] = tenant.videos.filter(is_public=True).filter(
-            models.Q(blocked_tenants__isnull=True) | ~models.Q(blocked_tenants=tenant)
-        ).distinct()
+        context["videos"] = (
+            tenant.videos.filter(is_public=True)
+            .filter(visible_to_tenant(tenant))
+            .only("pk", "tenant", "title", "slug", "description")
+        )
         return context
 
 
@@ -175,6 +315,8 @@ class TenantPortalView(LoginRequiredMixin, ListView):
     template_name = "stream/tenant_portal.html"
     context_object_name = "videos"
     CACHE_TIMEOUT = 60 * 15
+    STALE_TIMEOUT = 60 * 15
+    REBUILD_LOCK_TIMEOUT = 30
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -196,13 +338,29 @@ class TenantPortalView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         tenant = getattr(self.request.user, "tenant_profile", None)
         cache_key = self._get_cache_key(tenant)
-        payload = cache.get(cache_key)
-        if payload is None:
-            payload = self._build_portal_payload(tenant)
-            cache.set(cache_key, payload, timeout=self.CACHE_TIMEOUT)
+        entry = cache.get(cache_key)
+        if entry is None:
+            payload = self._refresh_portal_payload(tenant, cache_key)
+        elif entry["expires_at"] <= time.time() and cache.add(
+            f"{cache_key}:lock", True, timeout=self.REBUILD_LOCK_TIMEOUT
+        ):
+            # Stale: this request rebuilds while concurrent ones keep serving
+            # the previous payload instead of all rebuilding at once.
+            try:
+                payload = self._refresh_portal_payload(tenant, cache_key)
+            finally:
+                cache.delete(f"{cache_key}:lock")
+        else:
+            payload = entry["payload"]
         self._apply_portal_payload(payload)
         return payload["movie_videos"]
 
+    def _refresh_portal_payload(self, tenant, cache_key):
+        payload = self._build_portal_payload(tenant)
+        entry = {"payload": payload, "expires_at": time.time() + self.CACHE_TIMEOUT}
+        cache.set(cache_key, entry, timeout=self.CACHE_TIMEOUT + self.STALE_TIMEOUT)
+        return payload
+
     def _get_cache_key(self, tenant):
         slug = getattr(tenant, "slug", None) or "anonymous"
         return f"tenant_portal:{slug}"
@@ -230,62 +388,93 @@ class TenantPortalView(LoginRequiredMixin, ListView):
         self._videos_by_genre = payload.get("videos_by_genre", {})
 
     def _build_portal_payload(self, tenant):
-        queryset = Video.objects.filter(is_public=True)
+        # Everything the portal template and series payload read; anything
+        # left out here would be fetched again per video on access.
+        queryset = Video.objects.filter(is_public=True).only(
+            "id",
+            "series",
+            "season_number",
+            "episode_number",
+            "title",
+            "slug",
+            "description",
+            "source_url",
+            "video_type",
+            "cover_url",
+            "category",
+            "genre",
+            "created_at",
+        )
         if tenant:
-            queryset = queryset.filter(
-                models.Q(blocked_tenants__isnull=True) | ~models.Q(blocked_tenants=tenant)
-            )
+            queryset = queryset.filter(visible_to_tenant(tenant))
         else:
-            queryset = queryset.filter(blocked_tenants__isnull=True)
-        queryset = queryset.distinct()
-        all_videos = list(queryset)
-        progress_entries = []
+            queryset = queryset.filter(has_blocks=False)
         if tenant:
-            progress_entries = list(
-                VideoProgress.objects.filter(tenant=tenant, video__in=queryset).select_related("video")
+            progress = VideoProgress.objects.filter(tenant=tenant, video=OuterRef("pk"))
+            queryset = queryset.annotate(
+                resume_position=Coalesce(
+                    Subquery(progress.values("position")[:1]),
+                    Value(0.0),
+                    output_field=models.FloatField(),
+                ),
+                resume_updated=Subquery(progress.values("updated_at")[:1]),
             )
-        progress_map = {progress.video_id: progress.position for progress in progress_entries}
+        else:
+            queryset = queryset.annotate(
+                resume_position=Value(0.0, output_field=models.FloatField()),
+                resume_updated=Value(None, output_field=models.DateTimeField()),
+            )
+        all_videos = list(queryset)
+        progress_map = {}
+        continue_videos = []
+        tv_channels = []
+        mininovela_videos = []
+        movie_videos = []
+        videos_by_genre = {}
         for video in all_videos:
-            setattr(video, "resume_position", progress_map.get(video.id, 0))
-            setattr(video, "resume_label", format_duration_label(progress_map.get(video.id, 0)))
+            if video.resume_updated is not None:
+                progress_map[video.id] = video.resume_position
+                if video.resume_position > 0:
+                    continue_videos.append(video)
+            if video.series_id:
+                continue
+            category = video.category
+            if category == Video.CATEGORY_MOVIE:
+                movie_videos.append(video)
+                videos_by_genre.setdefault(video.genre or "outro", []).append(video)
+            elif category == Video.CATEGORY_TV:
+                tv_channels.append(video)
+            elif category == Video.CATEGORY_MININOVELA:
+                mininovela_videos.append(video)
+        continue_videos = heapq.nlargest(
+            CONTINUE_WATCHING_LIMIT,
+            continue_videos,
+            key=lambda video: video.resume_updated,
+        )
 
-        continue_videos = []
-        if progress_entries:
-            continue_entries = [
-                progress for progress in progress_entries if progress.position > 0
-            ]
-            continue_entries.sort(key=lambda entry: entry.updated_at, reverse=True)
-            continue_videos = [entry.video for entry in continue_entries[:20]]
-            for video in continue_videos:
-                video.resume_position = progress_map.get(video.id, 0)
-                video.resume_label = format_duration_label(video.resume_position)
-
-        continue_movies = [video for video in continue_videos if not video.series_id and video.category == Video.CATEGORY_MOVIE]
-        continue_series = [video for video in continue_videos if video.series_id and video.category != Video.CATEGORY_MININOVELA]
-        continue_tv = [video for video in continue_videos if video.category == Video.CATEGORY_TV]
+        continue_movies = []
+        continue_series = []
+        continue_tv = []
+        continue_mininovela = []
+        for video in continue_videos:
+            # Only the "continue watching" cards render a resume label.
+            video.resume_label = format_duration_label(video.resume_position)
+            category = video.category
+            if category == Video.CATEGORY_MININOVELA:
+                continue_mininovela.append(video)
+                continue
+            if video.series_id:
+                continue_series.append(video)
+            elif category == Video.CATEGORY_MOVIE:
+                continue_movies.append(video)
+            if category == Video.CATEGORY_TV:
+                continue_tv.append(video)
 
         series_payload_by_category, series_models_by_category = self._build_series_data(
             tenant,
             all_videos,
             progress_map,
         )
-        standalone_videos = [video for video in all_videos if not video.series_id and video.category != Video.CATEGORY_MININOVELA]
-
-        tv_channels = [video for video in standalone_videos if video.category == Video.CATEGORY_TV]
-        mininovela_videos = [
-            video
-            for video in all_videos
-            if video.category == Video.CATEGORY_MININOVELA and not video.series_id
-        ]
-        videos_by_genre = {}
-        for video in standalone_videos:
-            if video.category == Video.CATEGORY_MOVIE:
-                videos_by_genre.setdefault(video.genre or "outro", []).append(video)
-
-        movie_videos = [video for video in standalone_videos if video.category == Video.CATEGORY_MOVIE]
-        continue_mininovela = [
-            video for video in continue_videos if video.category == Video.CATEGORY_MININOVELA
-        ]
 
         return {
             "progress_map": progress_map,
@@ -295,7 +484,7 @@ class TenantPortalView(LoginRequiredMixin, ListView):
             "continue_tv": continue_tv,
             "continue_mininovela": continue_mininovela,
             "series_models_by_category": series_models_by_category,
-            "series_payload_json": json.dumps(series_payload_by_category, cls=DjangoJSONEncoder),
+            "series_payload_json": orjson.dumps(series_payload_by_category).decode(),
             "tv_channels": tv_channels,
             "mininovela_videos": mininovela_videos,
             "movie_videos": movie_videos,
@@ -317,20 +506,20 @@ class TenantPortalView(LoginRequiredMixin, ListView):
                 continue
             video_by_series.setdefault(video.series_id, []).append(video)
         series_ids = sorted(video_by_series.keys())
-        series_qs = (
-            Series.objects.filter(id__in=series_ids, is_active=True)
-            .annotate(episode_count=Count("episodes"))
-            .order_by("title")
-        )
+        series_qs = Series.objects.filter(id__in=series_ids, is_active=True).order_by("title")
         series_models = list(series_qs)
+        now = timezone.now()
         for series in series_models:
             episodes = video_by_series.get(series.id, [])
+            # Count the episodes this tenant can actually open rather than
+            # aggregating every episode of the series in SQL.
+            series.episode_count = len(episodes)
             episodes_sorted = sorted(
                 episodes,
                 key=lambda v: (
                     v.season_number or 1,
                     v.episode_number or 0,
-                    v.created_at or timezone.now(),
+                    v.created_at or now,
                 ),
             )
             episode_entries = []
@@ -362,7 +551,7 @@ class TenantPortalView(LoginRequiredMixin, ListView):
                 "slug": series.slug,
                 "description": series.description,
                 "cover_url": series.cover_url,
-                "episode_count": series.episode_count or len(episode_entries),
+                "episode_count": series.episode_count,
                 "seasons": seasons,
                 "episodes": episode_entries,
             }
@@ -383,9 +572,9 @@ class ResetContinueView(LoginRequiredMixin, View):
         video = get_object_or_404(Video, slug=video_slug, is_public=True)
         if not video.is_visible_to(tenant):
             raise Http404("Vídeo indisponível.")
-        progress = VideoProgress.objects.filter(tenant=tenant, video=video)
-        if progress.exists():
-            progress.delete()
+        deleted, _ = VideoProgress.objects.filter(tenant=tenant, video=video).delete()
+        cache.delete(_progress_cache_key(tenant, video))
+        if deleted:
             messages.success(request, f'Progresso de "{video.title}" reiniciado.')
         else:
             messages.info(request, f'Nenhum progresso registrado para "{video.title}".')
@@ -397,9 +586,10 @@ class WatchVideoView(TemplateView):
 
     def get(self, request, slug, video_slug):
         tenant = get_tenant_from_slug(slug)
-        queryset = Video.objects.filter(slug=video_slug, is_public=True)
-        queryset = queryset.filter(
-            models.Q(blocked_tenants__isnull=True) | ~models.Q(blocked_tenants=tenant)
+        queryset = (
+            Video.objects.filter(slug=video_slug, is_public=True)
+            .filter(visible_to_tenant(tenant))
+            .select_related("series")
         )
         video = queryset.first()
         if not video:
@@ -411,21 +601,17 @@ class WatchVideoView(TemplateView):
         next_video_url = None
         if video.series:
             series_title = video.series.title or ""
-            episodes_qs = Video.objects.filter(
-                series=video.series,
-                is_public=True,
-            ).filter(
-                models.Q(blocked_tenants__isnull=True) | ~models.Q(blocked_tenants=tenant)
-            )
-            episodes = list(episodes_qs)
-            episodes_sorted = sorted(
-                episodes,
-                key=lambda entry: (
-                    entry.season_number if entry.season_number is not None else 1,
-                    entry.episode_number if entry.episode_number is not None else 0,
-                    entry.created_at or timezone.now(),
-                ),
+            episodes_qs = (
+                Video.objects.filter(series=video.series, is_public=True)
+                .filter(visible_to_tenant(tenant))
+                .only("pk", "slug", "season_number", "episode_number")
+                .order_by(
+                    Coalesce("season_number", Value(1)),
+                    Coalesce("episode_number", Value(0)),
+                    "created_at",
+                )
             )
+            episodes_sorted = list(episodes_qs)
 
             def build_episode_url(target_video, autoplay=False):
                 url = reverse(
@@ -481,9 +667,9 @@ class WatchVideoView(TemplateView):
         return render(request, self.template_name, context)
 
 
-def _extract_m3u8_url(html):
-    match = M3U8_URL_PATTERN.search(html or "")
-    return match.group(0) if match else None
+def _extract_m3u8_url(content):
+    match = M3U8_URL_PATTERN.search(content or b"")
+    return match.group(0).decode("utf-8", "replace") if match else None
 
 
 class TvChannelStreamView(LoginRequiredMixin, View):
@@ -499,21 +685,35 @@ class TvChannelStreamView(LoginRequiredMixin, View):
         )
         if not video.is_visible_to(tenant):
             raise Http404("Vídeo indisponível para este tenant.")
+        # Viewers tuning in at the same time share one upstream fetch; failures
+        # are cached briefly too so a broken channel isn't hammered. Keying on
+        # the source URL means an edited channel never serves the old stream.
+        source_hash = hashlib.sha256(video.source_url.encode()).hexdigest()
+        cache_key = f"tv_m3u8:{video.pk}:{source_hash}"
+        cached = cache.get(cache_key)
+        if cached is None:
+            cached = self._resolve_stream(video.source_url)
+            timeout = TV_STREAM_CACHE_TIMEOUT if cached[1] == 200 else TV_STREAM_FAILURE_CACHE_TIMEOUT
+            cache.set(cache_key, cached, timeout=timeout)
+        payload, status = cached
+        return JsonResponse(payload, status=status)
+
+    def _resolve_stream(self, source_url):
         try:
-            response = requests.get(video.source_url, timeout=10, headers={"User-Agent": "Netfliz/1.0"})
+            response = _HTTP_SESSION.get(source_url, timeout=10, headers={"User-Agent": "Netfliz/1.0"})
         except requests.RequestException:
-            return JsonResponse({"detail": "Não foi possível recuperar o canal."}, status=502)
+            return {"detail": "Não foi possível recuperar o canal."}, 502
         if response.status_code != 200:
-            return JsonResponse({"detail": "Canal indisponível no momento."}, status=502)
-        m3u8_url = _extract_m3u8_url(response.text)
+            return {"detail": "Canal indisponível no momento."}, 502
+        m3u8_url = _extract_m3u8_url(response.content)
         if not m3u8_url:
-            return JsonResponse({"detail": "Não encontramos um link direto de reprodução."}, status=404)
-        return JsonResponse({"url": m3u8_url})
+            return {"detail": "Não encontramos um link direto de reprodução."}, 404
+        return {"url": m3u8_url}, 200
 
 
 def _clear_portal_cache():
-    tenants = Tenant.objects.filter(is_active=True)
-    cache_keys = [f"tenant_portal:{tenant.slug}" for tenant in tenants]
+    slugs = Tenant.objects.filter(is_active=True).values_list("slug", flat=True)
+    cache_keys = [f"tenant_portal:{slug}" for slug in slugs]
     cache.delete_many(cache_keys)
 
 
@@ -530,7 +730,7 @@ class OwnerDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
         context['video_form'] = VideoForm(owner=owner_tenant)
         context['series_form'] = SeriesForm()
         context['series_list'] = Series.objects.filter(tenant=owner_tenant)
-        context['videos'] = Video.objects.filter(tenant=owner_tenant)
+        context['videos'] = Video.objects.filter(tenant=owner_tenant).only("pk", "title", "slug")
         return context
 
     def post(self, request, *args, **kwargs):
@@ -662,12 +862,11 @@ class VideoProgressView(LoginRequiredMixin, View):
             return JsonResponse({"detail": "Vídeo indisponível."}, status=404)
         position = 0.0
         if request.content_type == "application/json":
-            import json
-
             try:
-                payload = json.loads(request.body.decode())
+                payload = orjson.loads(request.body)
                 position = float(payload.get("position", 0.0))
-            except (ValueError, json.JSONDecodeError):
+            except (AttributeError, TypeError, ValueError):
+                # orjson.JSONDecodeError subclasses ValueError.
                 position = 0.0
         else:
             try:
@@ -675,16 +874,30 @@ class VideoProgressView(LoginRequiredMixin, View):
             except (ValueError, TypeError):
                 position = 0.0
         position = max(0.0, position)
-        progress, _ = VideoProgress.objects.get_or_create(tenant=tenant, video=video)
-        progress.position = position
-        progress.save(update_fields=["position", "updated_at"])
+        # Paused players and duplicate unload beacons report (almost) the same
+        # position again; skip the write if it was just saved.
+        debounce_key = _progress_cache_key(tenant, video)
+        last_position = cache.get(debounce_key)
+        if last_position is not None and abs(position - last_position) < PROGRESS_DEBOUNCE_DELTA:
+            return JsonResponse({"position": position})
+        # Heartbeats almost always hit an existing row: try a bare UPDATE first
+        # (QuerySet.update() skips auto_now, so updated_at is set explicitly).
+        progress = VideoProgress.objects.filter(tenant=tenant, video=video)
+        if not progress.update(position=position, updated_at=timezone.now()):
+            try:
+                with transaction.atomic():
+                    VideoProgress.objects.create(tenant=tenant, video=video, position=position)
+            except IntegrityError:
+                # A concurrent heartbeat created the row first.
+                progress.update(position=position, updated_at=timezone.now())
+        cache.set(debounce_key, position, timeout=PROGRESS_DEBOUNCE_SECONDS)
         logger.info(
             "VideoProgressView saved: tenant=%s video=%s position=%.2f",
             tenant.slug,
             video.slug,
-            progress.position,
+            position,
         )
-        return JsonResponse({"position": progress.position})
+        return JsonResponse({"position": position})
 
 
 class PwaHeartbeatView(LoginRequiredMixin, View):